@@ -10,31 +10,164 @@ Usage examples:
 
 Structure: Course -> Learning Path -> Module -> Unit
 """
-import requests
-import json
-import time
+import asyncio
+import aiohttp
+import ahocorasick
+import orjson
 import re
 import argparse
 import os
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from datetime import datetime
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta
+from aiohttp_client_cache import CachedSession, SQLiteBackend
+from aiolimiter import AsyncLimiter
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urljoin, urlparse
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+HEADING_TAGS = ('h1', 'h2', 'h3', 'h4', 'h5', 'h6')
+
+_UNIT_URL_RE = re.compile(r'/(\d+)-')
+_UNIT_TITLE_RE = re.compile(r'^(\d+)[\.\s]')
+_UNIT_KEYWORD_RE = re.compile(r'introduction|summary|assessment|exercise')
+_UNIT_NUMBER_RE = re.compile(r'(?:1\d|[1-9])-')  # numbered units 1-19
+_UNSAFE_CHARS_RE = re.compile(r'[^\w\s-]')
+_SEPARATORS_RE = re.compile(r'[-\s]+')
+
+def build_keyword_matcher(categories: List[Tuple[str, List[str]]]) -> ahocorasick.Automaton:
+    """Aho-Corasick automaton mapping each keyword to (priority, category)"""
+    automaton = ahocorasick.Automaton()
+    for priority, (category, keywords) in enumerate(categories):
+        for keyword in keywords:
+            automaton.add_word(keyword, (priority, category))
+    automaton.make_automaton()
+    return automaton
+
+# Image type keywords, in priority order - the earliest category with any match wins.
+# Each automaton finds every keyword in a single scan of the string.
+_IMG_SRC_MATCHER = build_keyword_matcher([
+    ('diagram', ['diagram', 'architecture', 'flowchart', 'workflow']),
+    ('screenshot', ['screenshot', 'screen', 'ui', 'interface']),
+    ('chart', ['chart', 'graph', 'plot']),
+    ('code_example', ['code', 'snippet', 'example']),
+    ('icon', ['icon', 'logo', 'badge']),
+])
+_IMG_ALT_MATCHER = build_keyword_matcher([
+    ('diagram', ['diagram', 'architecture', 'flowchart', 'workflow', 'hierarchy']),
+    ('screenshot', ['screenshot', 'screen', 'interface', 'portal', 'page', 'window']),
+    ('chart', ['chart', 'graph', 'plot', 'visualization']),
+    ('code_example', ['code', 'snippet', 'example', 'syntax']),
+    ('icon', ['icon', 'logo', 'badge', 'button']),
+])
+
+def safe_filename(title: str) -> str:
+    """Turn a course title into the stem used for output filenames"""
+    safe_title = _UNSAFE_CHARS_RE.sub('', title).strip()
+    return _SEPARATORS_RE.sub('-', safe_title).lower()
+
+def course_slug(course_url: str) -> str:
+    """Last path segment of a course URL, e.g. dp-100t01"""
+    return urlparse(course_url).path.rstrip('/').split('/')[-1]
+
+def known_fields(cls, data: Dict) -> Dict:
+    """Keep only the keys of a loaded JSON object that are fields of the dataclass"""
+    names = {f.name for f in fields(cls)}
+    return {key: value for key, value in data.items() if key in names}
+
+# Course tree. Slotted dataclasses keep the per-node footprint small on large courses;
+# orjson serializes them directly, so they only turn back into dicts when loading a resume file.
+
+@dataclass(slots=True)
+class Unit:
+    url: str = ''
+    title: str = ''
+    number: int = 500
+    href: str = ''
+    content: str = ''
+    headings: List[Dict] = field(default_factory=list)
+    code_blocks: List[str] = field(default_factory=list)
+    images: List[Dict] = field(default_factory=list)
+    links: List[Dict] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Unit':
+        return cls(**known_fields(cls, data))
+
+    def copy_content(self, other: 'Unit'):
+        """Take over the scraped content of another unit"""
+        self.content = other.content
+        self.headings = other.headings
+        self.code_blocks = other.code_blocks
+        self.images = other.images
+        self.links = other.links
+
+@dataclass(slots=True)
+class Module:
+    url: str = ''
+    title: str = ''
+    description: str = ''
+    learning_objectives: List[str] = field(default_factory=list)
+    prerequisites: List[str] = field(default_factory=list)
+    units: List[Unit] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Module':
+        module = cls(**known_fields(cls, data))
+        module.units = [Unit.from_dict(unit) for unit in module.units]
+        return module
+
+@dataclass(slots=True)
+class LearningPath:
+    url: str = ''
+    title: str = ''
+    learn_uid: str = ''
+    modules: List[Module] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'LearningPath':
+        path = cls(**known_fields(cls, data))
+        path.modules = [Module.from_dict(module) for module in path.modules]
+        return path
+
+@dataclass(slots=True)
+class Course:
+    url: str = ''
+    title: str = ''
+    description: str = ''
+    learning_paths: List[LearningPath] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'Course':
+        course = cls(**known_fields(cls, data))
+        course.learning_paths = [LearningPath.from_dict(path) for path in course.learning_paths]
+        return course
 
 class AzureCourseScraper:
-    def __init__(self, max_paths=None, max_modules_per_path=None, max_units_per_module=None, extract_content=True):
+    def __init__(self, max_paths=None, max_modules_per_path=None, max_units_per_module=None, extract_content=True,
+                 concurrency=8, requests_per_second=4):
         self.base_url = "https://learn.microsoft.com"
-        self.session = requests.Session()
-        self.session.headers.update({
+        self.session = None  # CachedSession, opened by scrape_course
+        self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': 'gzip, deflate, br, zstd',  # br/zstd decoding comes from aiohttp[speedups]
             'DNT': '1',
             'Connection': 'keep-alive',
             'Upgrade-Insecure-Requests': '1'
-        })
+        }
+
+        # Bound in-flight requests and keep a global request rate to stay respectful
+        self.concurrency = concurrency
+        self.semaphore = asyncio.Semaphore(concurrency)
+        if requests_per_second >= 1:
+            self.rate_limiter = AsyncLimiter(requests_per_second, 1)
+        else:
+            # A bucket must hold at least one request, so slow rates stretch the period instead
+            self.rate_limiter = AsyncLimiter(1, 1 / requests_per_second)
 
         # Limits for large courses
         self.max_paths = max_paths
@@ -42,46 +175,69 @@ class AzureCourseScraper:
         self.max_units_per_module = max_units_per_module
         self.extract_content = extract_content
 
-    def fetch_page(self, url: str) -> Optional[str]:
+        # Already-scraped units keyed by (path title, module title, unit title)
+        self.existing_index: Dict[Tuple[str, str, str], Unit] = {}
+
+        # Totals for the summary, counted as the course tree is filled in
+        self.stats = {'paths': 0, 'modules': 0, 'units': 0}
+
+    async def fetch_page(self, url: str) -> Optional[str]:
         """Fetch a web page with error handling"""
         try:
-            print(f"  Fetching: {url}")
-            response = self.session.get(url, timeout=30)
-            if response.status_code == 200:
-                return response.text
-            else:
-                print(f"  HTTP {response.status_code} for {url}")
-                return None
+            async with self.semaphore:
+                # Cached pages are served from disk, so only live requests count against the rate limit
+                if not await self.session.cache.has_url(url):
+                    await self.rate_limiter.acquire()
+
+                print(f"  Fetching: {url}")
+                async with self.session.get(url) as response:
+                    if response.status == 200:
+                        return await response.text()
+                    else:
+                        print(f"  HTTP {response.status} for {url}")
+                        return None
         except Exception as e:
             print(f"  Error fetching {url}: {e}")
             return None
 
-    def parse_course_page(self, course_url: str) -> Dict:
+    def parse_through_last(self, html: str, marker: str, closing_tag: str) -> LexborHTMLParser:
+        """Build a tree from the document only up to the element holding the last marker
+
+        Course and learning path pages only need the <h1> plus the learning path articles or
+        module links, which are followed by a long tail of unrelated markup. Falls back to the
+        whole document if the marker is missing or the truncated tree has no <h1>.
+        """
+        last_marker = html.rfind(marker)
+        if last_marker != -1:
+            end = html.find(closing_tag, last_marker)
+            if end != -1:
+                tree = LexborHTMLParser(html[:end + len(closing_tag)])
+                if tree.css_first('h1'):
+                    return tree
+
+        return LexborHTMLParser(html)
+
+    async def parse_course_page(self, course_url: str) -> Optional[Course]:
         """Parse course overview page to extract learning paths"""
-        html = self.fetch_page(course_url)
+        html = await self.fetch_page(course_url)
         if not html:
-            return {}
+            return None
 
-        soup = BeautifulSoup(html, 'html.parser')
+        tree = self.parse_through_last(html, 'data-learn-uid', '</article>')
 
         # Extract course metadata
-        course_info = {
-            'url': course_url,
-            'title': '',
-            'description': '',
-            'learning_paths': []
-        }
+        course_info = Course(url=course_url)
 
         # Try to find course title
-        title_elem = soup.find('h1')
+        title_elem = tree.css_first('h1')
         if title_elem:
-            course_info['title'] = title_elem.get_text(strip=True)
+            course_info.title = title_elem.text(strip=True)
 
         # Look for learning path articles with data-learn-uid attributes
-        learning_path_articles = soup.find_all('article', attrs={'data-learn-uid': True})
+        learning_path_articles = tree.css('article[data-learn-uid]')
 
         for article in learning_path_articles:
-            learn_uid = article.get('data-learn-uid')
+            learn_uid = article.attributes.get('data-learn-uid')
             if learn_uid and learn_uid.startswith('learn.'):
                 # Convert UID to URL
                 # learn.wwl.explore-azure-machine-learning-workspace -> /training/paths/explore-azure-machine-learning-workspace/
@@ -92,42 +248,36 @@ class AzureCourseScraper:
                 # For now, we'll generate it from the slug
                 path_title = path_slug.replace('-', ' ').title()
 
-                course_info['learning_paths'].append({
-                    'title': path_title,
-                    'url': path_url,
-                    'learn_uid': learn_uid
-                })
+                course_info.learning_paths.append(LearningPath(
+                    title=path_title,
+                    url=path_url,
+                    learn_uid=learn_uid
+                ))
 
-        print(f"Found {len(course_info['learning_paths'])} learning paths")
+        print(f"Found {len(course_info.learning_paths)} learning paths")
 
         return course_info
 
-    def parse_learning_path(self, path_url: str) -> Dict:
-        """Parse learning path page to extract modules"""
-        html = self.fetch_page(path_url)
+    async def parse_learning_path(self, path_info: LearningPath) -> bool:
+        """Parse learning path page to fill in its title and modules"""
+        path_url = path_info.url
+        html = await self.fetch_page(path_url)
         if not html:
-            return {}
-
-        soup = BeautifulSoup(html, 'html.parser')
+            return False
 
-        path_info = {
-            'url': path_url,
-            'title': '',
-            'modules': []
-        }
+        tree = self.parse_through_last(html, 'modules', '</a>')
 
         # Try to extract title from page
-        title_elem = soup.find('h1')
-        if title_elem:
-            path_info['title'] = title_elem.get_text(strip=True)
+        title_elem = tree.css_first('h1')
+        path_info.title = title_elem.text(strip=True) if title_elem else ''
 
         # Find module links - look for relative paths that contain 'modules'
-        module_links = soup.find_all('a', href=lambda href: href and 'modules' in href)
+        module_links = tree.css('a[href*="modules"]')
 
-        seen_modules = set()
+        modules_by_url: Dict[str, Module] = {}
         for link in module_links:
-            href = link.get('href')
-            module_title = link.get_text(strip=True)
+            href = link.attributes.get('href')
+            module_title = link.text(strip=True)
 
             # Convert relative URL to absolute
             if href.startswith('../../modules/'):
@@ -144,51 +294,38 @@ class AzureCourseScraper:
             if not module_url.endswith('/'):
                 module_url += '/'
 
-            # Only add if we have a title and haven't seen this module
-            if module_title and module_url not in seen_modules:
-                seen_modules.add(module_url)
-                path_info['modules'].append({
-                    'title': module_title,
-                    'url': module_url
-                })
+            # Only add if we have a title - the first link to each module wins
+            if module_title and module_url not in modules_by_url:
+                modules_by_url[module_url] = Module(title=module_title, url=module_url)
 
-        print(f"Found {len(path_info['modules'])} modules")
-        return path_info
+        path_info.modules = list(modules_by_url.values())
+        print(f"Found {len(path_info.modules)} modules")
+        return True
 
-    def parse_module_page(self, module_url: str) -> Dict:
-        """Parse module page to extract units"""
-        html = self.fetch_page(module_url)
+    async def parse_module_page(self, module_info: Module) -> bool:
+        """Parse module page to fill in its title and units"""
+        module_url = module_info.url
+        html = await self.fetch_page(module_url)
         if not html:
-            return {}
-
-        soup = BeautifulSoup(html, 'html.parser')
+            return False
 
-        module_info = {
-            'url': module_url,
-            'title': '',
-            'description': '',
-            'learning_objectives': [],
-            'prerequisites': [],
-            'units': []
-        }
+        tree = LexborHTMLParser(html)
 
         # Extract title
-        title_elem = soup.find('h1')
-        if title_elem:
-            module_info['title'] = title_elem.get_text(strip=True)
+        title_elem = tree.css_first('h1')
+        module_info.title = title_elem.text(strip=True) if title_elem else ''
 
         # Find unit links - look for relative links with numbered patterns
-        all_links = soup.find_all('a', href=True)
-        unit_links = []
+        all_links = tree.css('a[href]')
+        units_by_url: Dict[str, Unit] = {}
 
         for link in all_links:
-            href = link.get('href', '')
-            unit_title = link.get_text(strip=True)
+            href = link.attributes.get('href') or ''
+            unit_title = link.text(strip=True)
 
             # Look for unit patterns like "1-introduction", "2-provision", etc.
-            if (href and unit_title and
-                any(keyword in href for keyword in ['introduction', 'summary', 'assessment', 'exercise']) or
-                any(href.startswith(f'{i}-') for i in range(1, 20))):  # Check for numbered units 1-19
+            if (href and unit_title and _UNIT_KEYWORD_RE.search(href) or
+                _UNIT_NUMBER_RE.match(href)):
 
                 # Convert relative URL to absolute
                 unit_url = urljoin(module_url, href)
@@ -196,35 +333,32 @@ class AzureCourseScraper:
                 # Try to extract unit number from URL or title
                 unit_number = self.extract_unit_number(unit_url, unit_title)
 
-                unit_links.append({
-                    'number': unit_number,
-                    'title': unit_title,
-                    'url': unit_url,
-                    'href': href
-                })
-
-        # Remove duplicates and sort by number
-        seen_urls = set()
-        for unit in unit_links:
-            if unit['url'] not in seen_urls:
-                seen_urls.add(unit['url'])
-                module_info['units'].append(unit)
+                # Remove duplicates - the first link to each unit wins
+                if unit_url not in units_by_url:
+                    units_by_url[unit_url] = Unit(
+                        number=unit_number,
+                        title=unit_title,
+                        url=unit_url,
+                        href=href
+                    )
 
         # Sort by unit number
-        module_info['units'].sort(key=lambda x: x['number'])
+        module_info.units = sorted(units_by_url.values(), key=attrgetter('number'))
 
-        print(f"  Found {len(module_info['units'])} units")
-        return module_info
+        print(f"  Found {len(module_info.units)} units")
+        return True
 
-    def extract_unit_number(self, unit_url: str, unit_title: str) -> int:
+    @staticmethod
+    @lru_cache(maxsize=2048)
+    def extract_unit_number(unit_url: str, unit_title: str) -> int:
         """Extract unit number from URL or title"""
         # Try to extract from URL like .../1-introduction/ or .../2-provision/
-        url_match = re.search(r'/(\d+)-', unit_url)
+        url_match = _UNIT_URL_RE.search(unit_url)
         if url_match:
             return int(url_match.group(1))
 
         # Try to extract from title
-        title_match = re.search(r'^(\d+)[\.\s]', unit_title)
+        title_match = _UNIT_TITLE_RE.search(unit_title)
         if title_match:
             return int(title_match.group(1))
 
@@ -244,336 +378,401 @@ class AzureCourseScraper:
 
         return 500  # Default middle value
 
-    def classify_image_type(self, src: str, alt_text: str) -> str:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def classify_image_type(src: str, alt_text: str) -> str:
         """Classify image type based on filename and alt text"""
-        src_lower = src.lower()
-        alt_lower = alt_text.lower()
-
-        # Check filename patterns
-        if any(pattern in src_lower for pattern in ['diagram', 'architecture', 'flowchart', 'workflow']):
-            return 'diagram'
-        elif any(pattern in src_lower for pattern in ['screenshot', 'screen', 'ui', 'interface']):
-            return 'screenshot'
-        elif any(pattern in src_lower for pattern in ['chart', 'graph', 'plot']):
-            return 'chart'
-        elif any(pattern in src_lower for pattern in ['code', 'snippet', 'example']):
-            return 'code_example'
-        elif any(pattern in src_lower for pattern in ['icon', 'logo', 'badge']):
-            return 'icon'
-
-        # Check alt text patterns
-        if any(pattern in alt_lower for pattern in ['diagram', 'architecture', 'flowchart', 'workflow', 'hierarchy']):
-            return 'diagram'
-        elif any(pattern in alt_lower for pattern in ['screenshot', 'screen', 'interface', 'portal', 'page', 'window']):
-            return 'screenshot'
-        elif any(pattern in alt_lower for pattern in ['chart', 'graph', 'plot', 'visualization']):
-            return 'chart'
-        elif any(pattern in alt_lower for pattern in ['code', 'snippet', 'example', 'syntax']):
-            return 'code_example'
-        elif any(pattern in alt_lower for pattern in ['icon', 'logo', 'badge', 'button']):
-            return 'icon'
+        # Check filename patterns, then alt text patterns
+        for matcher, text in ((_IMG_SRC_MATCHER, src), (_IMG_ALT_MATCHER, alt_text)):
+            best_match = min((match for _, match in matcher.iter(text.lower())), default=None)
+            if best_match:
+                return best_match[1]
 
         return 'illustration'  # Default type
 
-    def extract_image_context(self, img_elem) -> Dict:
+    def extract_image_context(self, img_elem, preceding_heading: str) -> Dict:
         """Extract contextual information around the image"""
         context = {
-            'preceding_heading': '',
+            'preceding_heading': preceding_heading,
             'following_text': '',
             'figure_caption': '',
             'parent_section': ''
         }
 
-        # Find preceding heading
-        current = img_elem
-        while current:
-            current = current.find_previous(['h1', 'h2', 'h3', 'h4', 'h5', 'h6'])
-            if current:
-                context['preceding_heading'] = current.get_text(strip=True)
-                break
-
         # Check if image is in a figure with caption
-        figure_parent = img_elem.find_parent('figure')
-        if figure_parent:
-            caption = figure_parent.find('figcaption')
+        figure_parent = img_elem.parent
+        while figure_parent is not None and figure_parent.tag != 'figure':
+            figure_parent = figure_parent.parent
+        if figure_parent is not None:
+            caption = figure_parent.css_first('figcaption')
             if caption:
-                context['figure_caption'] = caption.get_text(strip=True)
-
-        # Get following text (next paragraph or text node)
-        next_elem = img_elem.find_next('p')
-        if next_elem:
-            text = next_elem.get_text(strip=True)
-            if len(text) > 10:  # Only meaningful text
-                context['following_text'] = text[:200]  # Limit to 200 chars
+                context['figure_caption'] = caption.text(strip=True)
 
         return context
 
-    def parse_unit_content(self, unit_url: str, output_dir: str = "output",
-                          course_title: str = "", learning_path: str = "",
-                          module_title: str = "") -> Dict:
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def resolve_image_src(src: str, unit_url: str) -> Tuple[str, str]:
+        """Resolve an image src to its absolute URL and filename"""
+        # Convert relative URLs to absolute
+        if src.startswith('../../'):
+            # Handle relative paths like ../../wwl-azure/module/media/image.png
+            absolute_src = f"https://learn.microsoft.com/en-us/{src[6:]}"
+        elif src.startswith('/'):
+            absolute_src = f"https://learn.microsoft.com{src}"
+        elif not src.startswith('http'):
+            absolute_src = urljoin(unit_url, src)
+        else:
+            absolute_src = src
+
+        # Get image filename and extension
+        filename = os.path.basename(absolute_src)
+        if '?' in filename:
+            filename = filename.split('?')[0]
+
+        return absolute_src, filename
+
+    def extract_image_info(self, img_elem, src: str, unit_url: str, preceding_heading: str) -> Dict:
+        """Build image metadata (no download) for an <img> element"""
+        alt = img_elem.attributes.get('alt') or ''
+        title = img_elem.attributes.get('title') or ''
+
+        absolute_src, filename = self.resolve_image_src(src, unit_url)
+
+        # Classify image type based on alt text and filename
+        image_type = self.classify_image_type(src, alt)
+
+        # Extract contextual information
+        context = self.extract_image_context(img_elem, preceding_heading)
+
+        return {
+            'src': src,
+            'absolute_url': absolute_src,
+            'alt_text': alt,
+            'title': title,
+            'filename': filename,
+            'image_type': image_type,
+            'context': context
+        }
+
+    async def parse_unit_content(self, unit_info: Unit) -> bool:
         """Parse individual unit content"""
         if not self.extract_content:
-            return {'content_skipped': True}
+            return False
 
-        html = self.fetch_page(unit_url)
+        unit_url = unit_info.url
+        html = await self.fetch_page(unit_url)
         if not html:
-            return {}
-
-        soup = BeautifulSoup(html, 'html.parser')
+            return False
 
-        unit_info = {
-            'content': '',
-            'headings': [],
-            'code_blocks': [],
-            'images': [],
-            'links': []
-        }
+        tree = LexborHTMLParser(html)
 
         # Find the main content area
-        content_elem = soup.find('main') or soup.find('article') or soup
+        content_elem = tree.css_first('main') or tree.css_first('article') or tree.root
 
         if content_elem:
-            # Extract clean text content
             # Remove script and style elements
-            for script in content_elem(["script", "style", "nav", "footer", "header"]):
-                script.decompose()
+            for node in content_elem.css('script, style, nav, footer, header'):
+                node.decompose()
+
+            texts = []
+            current_heading = ''
+            awaiting_text = []  # contexts of images still waiting for their following paragraph
+
+            # Walk the content once, collecting text, headings, code, images and links
+            for node in content_elem.traverse(include_text=True):
+                tag = node.tag
+
+                if tag == '-text':
+                    text = node.text_content.strip()
+                    if text:
+                        texts.append(text)
+
+                elif tag in HEADING_TAGS:
+                    current_heading = node.text(strip=True)
+                    unit_info.headings.append({
+                        'level': int(tag[1]),
+                        'text': current_heading
+                    })
+
+                elif tag == 'code' or tag == 'pre':
+                    # Read the text once; short spans can't pass the length check, so skip the strip
+                    code_text = node.text(deep=True)
+                    if len(code_text) > 10:
+                        code_text = code_text.strip()
+                        if len(code_text) > 10:  # Only meaningful code blocks
+                            unit_info.code_blocks.append(code_text)
+
+                elif tag == 'p':
+                    if awaiting_text:
+                        text = node.text(strip=True)
+                        if len(text) > 10:  # Only meaningful text
+                            for context in awaiting_text:
+                                context['following_text'] = text[:200]  # Limit to 200 chars
+                        awaiting_text.clear()
+
+                elif tag == 'img':
+                    src = node.attributes.get('src') or ''
+                    if src:
+                        image_info = self.extract_image_info(node, src, unit_url, current_heading)
+                        unit_info.images.append(image_info)
+                        awaiting_text.append(image_info['context'])
+
+                elif tag == 'a':
+                    href = node.attributes.get('href')
+                    if href:
+                        link_text = node.text(strip=True)
+                        if link_text:
+                            unit_info.links.append({
+                                'url': href,
+                                'text': link_text
+                            })
 
             # Get text with some structure
-            unit_info['content'] = content_elem.get_text(separator='\n', strip=True)
-
-            # Extract headings
-            for heading in content_elem.find_all(['h1', 'h2', 'h3', 'h4', 'h5', 'h6']):
-                level = int(heading.name[1])
-                text = heading.get_text(strip=True)
-                unit_info['headings'].append({
-                    'level': level,
-                    'text': text
-                })
-
-            # Extract code blocks
-            for code_elem in content_elem.find_all(['code', 'pre']):
-                code_text = code_elem.get_text(strip=True)
-                if len(code_text) > 10:  # Only meaningful code blocks
-                    unit_info['code_blocks'].append(code_text)
-
-            # Extract images with metadata only
-            for img in content_elem.find_all('img'):
-                src = img.get('src', '')
-                alt = img.get('alt', '')
-                title = img.get('title', '')
-
-                if src:
-                    # Convert relative URLs to absolute
-                    if src.startswith('../../'):
-                        # Handle relative paths like ../../wwl-azure/module/media/image.png
-                        absolute_src = f"https://learn.microsoft.com/en-us/{src[6:]}"
-                    elif src.startswith('/'):
-                        absolute_src = f"https://learn.microsoft.com{src}"
-                    elif not src.startswith('http'):
-                        absolute_src = urljoin(unit_url, src)
-                    else:
-                        absolute_src = src
-
-                    # Classify image type based on alt text and filename
-                    image_type = self.classify_image_type(src, alt)
-
-                    # Extract contextual information
-                    context = self.extract_image_context(img)
-
-                    # Get image filename and extension
-                    filename = os.path.basename(absolute_src)
-                    if '?' in filename:
-                        filename = filename.split('?')[0]
-
-                    image_info = {
-                        'src': src,
-                        'absolute_url': absolute_src,
-                        'alt_text': alt,
-                        'title': title,
-                        'filename': filename,
-                        'image_type': image_type,
-                        'context': context
-                    }
-
-                    unit_info['images'].append(image_info)
-
-            # Extract links
-            for link in content_elem.find_all('a', href=True):
-                href = link.get('href')
-                link_text = link.get_text(strip=True)
-                if href and link_text:
-                    unit_info['links'].append({
-                        'url': href,
-                        'text': link_text
-                    })
+            unit_info.content = '\n'.join(texts)
 
-        return unit_info
+        return True
 
-    def scrape_course(self, course_url: str, output_dir: str = "output", resume: bool = True) -> Dict:
+    async def scrape_course(self, course_url: str, output_dir: str = "output", resume: bool = True) -> Optional[Course]:
         """Main method to scrape entire course"""
         print(f"Starting course scrape: {course_url}")
 
-        # Check for existing data to resume from
-        existing_data = None
-        if resume:
-            existing_data = self.load_existing_data(course_url, output_dir)
-            if existing_data:
-                print("Found existing data - resuming from previous run")
-
-        # Parse course overview (or use existing data)
-        if existing_data:
-            course_data = existing_data
-            print(f"Loaded existing course: {course_data.get('title', 'Unknown')}")
-        else:
-            course_data = self.parse_course_page(course_url)
-            if not course_data['learning_paths']:
-                print("No learning paths found!")
-                return {}
-
-        # Apply path limit
-        paths_to_process = course_data['learning_paths']
-        if self.max_paths:
-            paths_to_process = paths_to_process[:self.max_paths]
-
-        # Process each learning path
-        for path_idx, path_info in enumerate(paths_to_process):
-            print(f"\n--- Learning Path {path_idx + 1}: {path_info['title']} ---")
-
-            # Parse learning path
-            path_data = self.parse_learning_path(path_info['url'])
-            path_info.update(path_data)
-
-            # Check if path_data was successfully parsed
-            if not path_data or 'modules' not in path_info:
-                print(f"  Skipping {path_info['title']} - failed to parse or no modules found")
-                continue
-
-            # Apply module limit
-            modules_to_process = path_info['modules']
-            if self.max_modules_per_path:
-                modules_to_process = modules_to_process[:self.max_modules_per_path]
-
-            # Process each module
-            for module_idx, module_info in enumerate(modules_to_process):
-                print(f"  Module {module_idx + 1}: {module_info['title']}")
+        # Cache responses on disk (including 404s) so repeat and resumed runs skip the network
+        cache = SQLiteBackend(os.path.join(output_dir, 'azure_scrape.sqlite'),
+                              expire_after=timedelta(days=7), allowed_codes=(200, 404))
+
+        # Every page lives on one host, so size the keep-alive pool to the concurrency limit
+        # and hold idle connections (and the DNS answer) open across the rate-limited gaps
+        connector = aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency,
+                                         keepalive_timeout=60, ttl_dns_cache=300)
+
+        async with CachedSession(cache=cache, headers=self.headers, connector=connector,
+                                 timeout=aiohttp.ClientTimeout(total=30)) as self.session:
+            await self.session.cache.delete_expired_responses()
+
+            # Check for existing data to resume from
+            course_info = None
+            existing_data = None
+            if resume:
+                json_filename = self.find_existing_file(course_url, output_dir)
+                if not json_filename:
+                    # No summary from a previous run - fall back to the title-based filename
+                    course_info = await self.parse_course_page(course_url)
+                    if course_info:
+                        json_filename = os.path.join(output_dir, f"{safe_filename(course_info.title)}_complete.json")
+
+                if json_filename:
+                    existing_data = self.load_existing_data(json_filename)
+                    if existing_data:
+                        print("Found existing data - resuming from previous run")
 
-                # Parse module
-                module_data = self.parse_module_page(module_info['url'])
-                module_info.update(module_data)
+            # Use existing data if available
+            if existing_data:
+                course_data = existing_data
+                self.existing_index = self.index_existing_units(existing_data)
+                print(f"Loaded existing course: {course_data.title or 'Unknown'}")
+            else:
+                # Parse course overview (unless already fetched above)
+                if course_info is None:
+                    course_info = await self.parse_course_page(course_url)
+                course_data = course_info
+                if not course_data or not course_data.learning_paths:
+                    print("No learning paths found!")
+                    return None
+
+            # Units finished before an interrupted run are in the checkpoint, even without a complete JSON
+            checkpoint_filename = self.checkpoint_filename(course_url, output_dir)
+            if resume:
+                for key, unit in self.load_checkpoint(checkpoint_filename).items():
+                    self.existing_index.setdefault(key, unit)
+
+            # Totals describe the tree that gets written, including parts kept from a previous run
+            self.stats = {'paths': len(course_data.learning_paths), 'modules': 0, 'units': 0}
+
+            # Apply path limit
+            paths_to_process = course_data.learning_paths
+            if self.max_paths:
+                paths_to_process = paths_to_process[:self.max_paths]
+            for path_info in course_data.learning_paths[len(paths_to_process):]:
+                self.count_existing(path_info.modules)
+
+            # Fetch all learning paths concurrently
+            path_results = await asyncio.gather(
+                *(self.parse_learning_path(path_info) for path_info in paths_to_process)
+            )
+
+            modules_to_process = []
+            for path_idx, (path_info, parsed) in enumerate(zip(paths_to_process, path_results)):
+                print(f"\n--- Learning Path {path_idx + 1}: {path_info.title} ---")
+
+                # Check if the path page was successfully parsed
+                if not parsed:
+                    print(f"  Skipping {path_info.title} - failed to parse or no modules found")
+                    self.count_existing(path_info.modules)
+                    continue
+
+                self.stats['modules'] += len(path_info.modules)
+
+                # Apply module limit
+                path_modules = path_info.modules
+                if self.max_modules_per_path:
+                    path_modules = path_modules[:self.max_modules_per_path]
+                self.count_existing(path_info.modules[len(path_modules):], count_modules=False)
+
+                modules_to_process.extend((path_info, module_info) for module_info in path_modules)
+
+            # Fetch all modules concurrently
+            module_results = await asyncio.gather(
+                *(self.parse_module_page(module_info) for _, module_info in modules_to_process)
+            )
+
+            units_to_process = []
+            for (path_info, module_info), parsed in zip(modules_to_process, module_results):
+                print(f"  Module: {module_info.title}")
+
+                # A failed module keeps any units from a previous run, so count them either way
+                self.stats['units'] += len(module_info.units)
+
+                # Check if the module page was successfully parsed
+                if not parsed:
+                    print(f"    Skipping {module_info.title} - failed to parse")
+                    continue
 
                 # Apply unit limit
-                units_to_process = module_info['units']
+                module_units = module_info.units
                 if self.max_units_per_module:
-                    units_to_process = units_to_process[:self.max_units_per_module]
+                    module_units = module_units[:self.max_units_per_module]
 
-                # Process each unit
-                for unit_idx, unit_info in enumerate(units_to_process):
-                    print(f"    Unit {unit_idx + 1}: {unit_info['title']}")
+                for unit_idx, unit_info in enumerate(module_units):
+                    print(f"    Unit {unit_idx + 1}: {unit_info.title}")
 
                     # Check if we should skip this unit (already scraped)
-                    if existing_data:
-                        existing_unit_content = self.get_existing_unit_content(existing_data, path_info['title'], module_info['title'], unit_info['title'])
-                        if existing_unit_content:
-                            print(f"      Skipping - already scraped")
-                            unit_info.update(existing_unit_content)
-                            continue
-
-                    # Parse unit content
-                    if self.extract_content:
-                        unit_content = self.parse_unit_content(
-                            unit_info['url'], output_dir,
-                            course_data['title'], path_info['title'], module_info['title']
-                        )
-                        unit_info.update(unit_content)
-
-                    # Small delay to be respectful
-                    time.sleep(0.5)
-
-                # Small delay between modules
-                time.sleep(0.5)
-
-            # Small delay between learning paths
-            time.sleep(0.5)
+                    existing_unit = self.existing_index.get((path_info.title, module_info.title, unit_info.title))
+                    if existing_unit:
+                        print("      Skipping - already scraped")
+                        unit_info.copy_content(existing_unit)
+                        continue
+
+                    units_to_process.append((path_info, module_info, unit_info))
+
+            # Fetch all unit content concurrently, appending each unit to the checkpoint as it lands
+            if self.extract_content:
+                with open(checkpoint_filename, 'ab' if resume else 'wb') as checkpoint:
+                    async def scrape_unit(path_info: LearningPath, module_info: Module, unit_info: Unit):
+                        if await self.parse_unit_content(unit_info):
+                            checkpoint.write(orjson.dumps({
+                                'path': path_info.title,
+                                'module': module_info.title,
+                                'unit': unit_info.title,
+                                'data': unit_info
+                            }) + b'\n')
+                            checkpoint.flush()
+
+                    await asyncio.gather(*(scrape_unit(*entry) for entry in units_to_process))
 
         return course_data
 
-    def generate_training_jsonl(self, course_data: Dict, output_file: str):
-        """Generate JSONL format for training - one record per unit"""
-        with open(output_file, 'w', encoding='utf-8') as f:
-            for path in course_data.get('learning_paths', []):
-                for module in path.get('modules', []):
-                    for unit in module.get('units', []):
-                        if unit.get('content'):
-                            record = {
-                                'course_title': course_data.get('title', ''),
-                                'learning_path': path.get('title', ''),
-                                'module_title': module.get('title', ''),
-                                'unit_title': unit.get('title', ''),
-                                'unit_url': unit.get('url', ''),
-                                'content': unit.get('content', ''),
-                                'headings': unit.get('headings', []),
-                                'code_blocks': unit.get('code_blocks', []),
-                                'images': unit.get('images', []),
-                                'scraped_at': datetime.now().isoformat()
-                            }
-                            f.write(json.dumps(record) + '\n')
-
-    def load_existing_data(self, course_url: str, output_dir: str) -> Dict:
-        """Load existing scraped data if available"""
-        # Generate the same filename that would be used for this course
-        course_data = self.parse_course_page(course_url)
-        if not course_data:
-            return None
+    def count_existing(self, modules: List[Module], count_modules: bool = True):
+        """Add modules that aren't parsed this run to the totals, with the units they already hold"""
+        if count_modules:
+            self.stats['modules'] += len(modules)
+        self.stats['units'] += sum(len(module.units) for module in modules)
 
-        course_title = course_data.get('title', 'unknown-course')
-        safe_title = re.sub(r'[^\w\s-]', '', course_title).strip()
-        safe_title = re.sub(r'[-\s]+', '-', safe_title).lower()
+    def generate_training_jsonl(self, course_data: Course, output_file: str):
+        """Generate JSONL format for training - one record per unit"""
+        scraped_at = datetime.now().isoformat()
+        lines = []
+        for path in course_data.learning_paths:
+            for module in path.modules:
+                for unit in module.units:
+                    if unit.content:
+                        record = {
+                            'course_title': course_data.title,
+                            'learning_path': path.title,
+                            'module_title': module.title,
+                            'unit_title': unit.title,
+                            'unit_url': unit.url,
+                            'content': unit.content,
+                            'headings': unit.headings,
+                            'code_blocks': unit.code_blocks,
+                            'images': unit.images,
+                            'scraped_at': scraped_at
+                        }
+                        lines.append(orjson.dumps(record) + b'\n')
+
+        # Write all records in one go
+        with open(output_file, 'wb') as f:
+            f.write(b''.join(lines))
+
+    def find_existing_file(self, course_url: str, output_dir: str) -> Optional[str]:
+        """Find the complete JSON of a previous run from its summary file, without fetching anything"""
+        slug = course_slug(course_url)
+        for summary_path in Path(output_dir).glob('*_summary.json'):
+            try:
+                summary = orjson.loads(summary_path.read_bytes())
+            except (orjson.JSONDecodeError, IOError):
+                continue
 
-        json_filename = os.path.join(output_dir, f"{safe_title}_complete.json")
+            if course_slug(summary.get('course_url', '')) == slug:
+                stem = summary_path.name[:-len('_summary.json')]
+                return str(summary_path.with_name(f"{stem}_complete.json"))
+        return None
 
+    def load_existing_data(self, json_filename: str) -> Optional[Course]:
+        """Load existing scraped data if available"""
         if os.path.exists(json_filename):
             try:
-                with open(json_filename, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
+                with open(json_filename, 'rb') as f:
+                    return Course.from_dict(orjson.loads(f.read()))
+            except (orjson.JSONDecodeError, IOError) as e:
                 print(f"Error loading existing data: {e}")
                 return None
         return None
 
-    def should_skip_unit(self, existing_data: Dict, path_title: str, module_title: str, unit_title: str) -> bool:
-        """Check if a unit already has content in existing data"""
-        if not existing_data or 'learning_paths' not in existing_data:
-            return False
-
-        for path in existing_data.get('learning_paths', []):
-            if path.get('title') == path_title:
-                for module in path.get('modules', []):
-                    if module.get('title') == module_title:
-                        for unit in module.get('units', []):
-                            if unit.get('title') == unit_title and unit.get('content'):
-                                return True
-        return False
-
-    def get_existing_unit_content(self, existing_data: Dict, path_title: str, module_title: str, unit_title: str) -> Dict:
-        """Get existing unit content if available"""
-        if not existing_data or 'learning_paths' not in existing_data:
-            return None
-
-        for path in existing_data.get('learning_paths', []):
-            if path.get('title') == path_title:
-                for module in path.get('modules', []):
-                    if module.get('title') == module_title:
-                        for unit in module.get('units', []):
-                            if unit.get('title') == unit_title and unit.get('content'):
-                                # Return the content fields from the existing unit
-                                return {
-                                    'content': unit.get('content'),
-                                    'headings': unit.get('headings', []),
-                                    'code_blocks': unit.get('code_blocks', []),
-                                    'images': unit.get('images', []),
-                                    'links': unit.get('links', [])
-                                }
-        return None
+    def checkpoint_filename(self, course_url: str, output_dir: str) -> str:
+        """Per-course checkpoint of scraped units, removed once the complete JSON is written"""
+        return os.path.join(output_dir, f"{course_slug(course_url)}_checkpoint.jsonl")
+
+    def load_checkpoint(self, checkpoint_filename: str) -> Dict[Tuple[str, str, str], Unit]:
+        """Index the units recorded in a checkpoint by (path, module, unit) title"""
+        checkpoint_index = {}
+        if not os.path.exists(checkpoint_filename):
+            return checkpoint_index
+
+        with open(checkpoint_filename, 'rb') as f:
+            for line in f:
+                try:
+                    entry = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    # A crash can leave the last line half-written
+                    continue
+                checkpoint_index.setdefault((entry['path'], entry['module'], entry['unit']),
+                                            Unit.from_dict(entry['data']))
+
+        if checkpoint_index:
+            print(f"Found {len(checkpoint_index)} units in checkpoint")
+        return checkpoint_index
+
+    def index_existing_units(self, existing_data: Course) -> Dict[Tuple[str, str, str], Unit]:
+        """Index units that already have content by (path, module, unit) title"""
+        existing_index = {}
+        for path in existing_data.learning_paths:
+            for module in path.modules:
+                for unit in module.units:
+                    if unit.content:
+                        # Keep the content from the first matching unit
+                        existing_index.setdefault((path.title, module.title, unit.title), unit)
+        return existing_index
+
+def positive_number(value_type):
+    """argparse type that only accepts values greater than zero"""
+    def parse(text: str):
+        value = value_type(text)
+        if value <= 0:
+            raise argparse.ArgumentTypeError(f"must be greater than 0, got {text}")
+        return value
+    parse.__name__ = value_type.__name__  # Used in argparse's 'invalid ... value' message
+    return parse
 
 def main():
     parser = argparse.ArgumentParser(description='Scrape Azure Learning courses for training data')
@@ -584,6 +783,8 @@ def main():
     parser.add_argument('--no-content', action='store_true', help='Skip content extraction (structure only)')
     parser.add_argument('--no-resume', action='store_true', help='Start from scratch (ignore existing data)')
     parser.add_argument('--output-dir', default='output', help='Output directory for files')
+    parser.add_argument('--concurrency', type=positive_number(int), default=8, help='Maximum number of requests in flight at once')
+    parser.add_argument('--rate', type=positive_number(float), default=4, help='Maximum requests per second across the whole scrape')
 
     args = parser.parse_args()
 
@@ -595,7 +796,9 @@ def main():
         max_paths=args.max_paths,
         max_modules_per_path=args.max_modules,
         max_units_per_module=args.max_units,
-        extract_content=not args.no_content
+        extract_content=not args.no_content,
+        concurrency=args.concurrency,
+        requests_per_second=args.rate
     )
 
     print("Azure Course Scraper - Metadata Only Version")
@@ -607,24 +810,28 @@ def main():
         print(f"Max modules per path: {args.max_modules}")
     if args.max_units:
         print(f"Max units per module: {args.max_units}")
+    print(f"Concurrency: {args.concurrency} requests, {args.rate} requests/second")
 
     start_time = datetime.now()
     print(f"Started at: {start_time}")
 
     try:
         # Scrape the course
-        course_data = scraper.scrape_course(args.course_url, args.output_dir, resume=not args.no_resume)
+        course_data = asyncio.run(scraper.scrape_course(args.course_url, args.output_dir, resume=not args.no_resume))
 
         if course_data:
             # Generate output files
-            course_title = course_data.get('title', 'unknown-course')
-            safe_title = re.sub(r'[^\w\s-]', '', course_title).strip()
-            safe_title = re.sub(r'[-\s]+', '-', safe_title).lower()
+            safe_title = safe_filename(course_data.title)
 
             # Complete JSON file
             json_filename = os.path.join(args.output_dir, f"{safe_title}_complete.json")
-            with open(json_filename, 'w', encoding='utf-8') as f:
-                json.dump(course_data, f, indent=2, ensure_ascii=False)
+            with open(json_filename, 'wb') as f:
+                f.write(orjson.dumps(course_data, option=orjson.OPT_INDENT_2))
+
+            # Everything in the checkpoint is now in the complete JSON
+            checkpoint_filename = scraper.checkpoint_filename(args.course_url, args.output_dir)
+            if os.path.exists(checkpoint_filename):
+                os.remove(checkpoint_filename)
 
             # Training JSONL file
             if not args.no_content:
@@ -633,12 +840,12 @@ def main():
 
             # Summary file
             summary = {
-                'course_title': course_data.get('title', ''),
+                'course_title': course_data.title,
                 'course_url': args.course_url,
                 'scraped_at': start_time.isoformat(),
-                'learning_paths_count': len(course_data.get('learning_paths', [])),
-                'total_modules': sum(len(path.get('modules', [])) for path in course_data.get('learning_paths', [])),
-                'total_units': sum(len(module.get('units', [])) for path in course_data.get('learning_paths', []) for module in path.get('modules', [])),
+                'learning_paths_count': scraper.stats['paths'],
+                'total_modules': scraper.stats['modules'],
+                'total_units': scraper.stats['units'],
                 'content_extracted': not args.no_content,
                 'limits_applied': {
                     'max_paths': args.max_paths,
@@ -652,13 +859,13 @@ def main():
             }
 
             summary_filename = os.path.join(args.output_dir, f"{safe_title}_summary.json")
-            with open(summary_filename, 'w', encoding='utf-8') as f:
-                json.dump(summary, f, indent=2)
+            with open(summary_filename, 'wb') as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
 
             print("\n=== SCRAPING COMPLETE ===")
-            print(f"Learning paths: {len(course_data.get('learning_paths', []))}")
-            print(f"Total modules: {sum(len(path.get('modules', [])) for path in course_data.get('learning_paths', []))}")
-            print(f"Total units: {sum(len(module.get('units', [])) for path in course_data.get('learning_paths', []) for module in path.get('modules', []))}")
+            print(f"Learning paths: {scraper.stats['paths']}")
+            print(f"Total modules: {scraper.stats['modules']}")
+            print(f"Total units: {scraper.stats['units']}")
             print(f"Content extracted: {not args.no_content}")
             print(f"JSON file: {json_filename}")
             if not args.no_content:
@@ -0,0 +1,186 @@
+"""
+Shared quiz code for the exam question banks in the *_data directories.
+Each course's quiz.py front-end imports this module and runs from its own data
+directory, so all file names below are relative to the current directory.
+"""
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+import mmap
+import os
+import pickle
+import sys
+from datetime import datetime
+
+QUESTIONS_FILE = 'exam_questions.jsonl'
+QUESTIONS_CACHE = 'exam_questions.pkl'
+QUESTIONS_CACHE_VERSION = 2  # Bump when load_questions adds or changes derived fields
+VALID_ANSWERS = frozenset('ABCD')
+HEADER_FILE = 'quiz_header.json'
+PROGRESS_FILE = 'quiz_progress.jsonl'
+QUIZ_QUESTIONS_FILE = 'quiz_questions.pkl'
+
+def write_atomic(filename, data):
+    """Write data to a temp file and rename it into place, so a crash never leaves a partial file."""
+    tmp = filename + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, filename)
+
+def parse_jsonl(filename):
+    """Parse each non-empty line of a JSONL file straight out of a memory map."""
+    records = []
+    with open(filename, 'rb') as f:
+        if not os.fstat(f.fileno()).st_size:
+            return records  # Empty files can't be mapped
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # orjson parses memoryview slices of the map without copying them; json needs bytes
+            buf = memoryview(mm) if _json.__name__ == 'orjson' else mm[:]
+            try:
+                start, size = 0, len(mm)
+                while start < size:
+                    end = mm.find(b'\n', start)
+                    if end == -1:
+                        end = size
+                    if end > start:
+                        records.append(_json.loads(buf[start:end]))
+                    start = end + 1
+            finally:
+                del buf  # The view has to go before the map can close, even if a line fails to parse
+    return records
+
+def load_questions():
+    # Reuse the parsed questions from a previous run unless the JSONL or the cache format has changed since
+    if (os.path.exists(QUESTIONS_CACHE)
+            and os.stat(QUESTIONS_CACHE).st_mtime_ns >= os.stat(QUESTIONS_FILE).st_mtime_ns):
+        with open(QUESTIONS_CACHE, 'rb') as f:
+            cached = pickle.load(f)
+        if isinstance(cached, dict) and cached.get('version') == QUESTIONS_CACHE_VERSION:
+            return cached['questions']
+
+    questions = parse_jsonl(QUESTIONS_FILE)
+
+    # Intern the strings many questions share; the pickle keeps them shared on later loads
+    for q in questions:
+        q['learning_path'] = sys.intern(q['learning_path'])
+        q['module'] = sys.intern(q['module'])
+        q['correct_answer'] = sys.intern(q['correct_answer'])
+
+    # Render each question's options block and review previews once here rather than on every display
+    for q in questions:
+        q['_rendered_options'] = '\n'.join(f"{option}) {text}" for option, text in q['options'].items())
+        q['_question_preview'] = q['question'][:80]
+        q['_explanation_preview'] = q['explanation'][:150]
+
+    cached = {'version': QUESTIONS_CACHE_VERSION, 'questions': questions}
+    write_atomic(QUESTIONS_CACHE, pickle.dumps(cached, protocol=pickle.HIGHEST_PROTOCOL))
+    return questions
+
+def load_progress():
+    """Load saved progress if it exists."""
+    if not all(os.path.exists(filename) for filename in (HEADER_FILE, PROGRESS_FILE, QUIZ_QUESTIONS_FILE)):
+        return None
+
+    with open(HEADER_FILE, 'rb') as f:
+        progress = _json.loads(f.read())
+    progress.update(current_index=0, score=0, answers=[])
+    progress['timestamp'] = datetime.fromtimestamp(os.path.getmtime(PROGRESS_FILE)).isoformat()
+
+    # Replay the answer log - the last complete line holds the current index and score
+    with open(PROGRESS_FILE, 'rb') as f:
+        data = f.read()
+    good_end = 0  # Byte offset just past the last complete, parseable line
+    while True:
+        end = data.find(b'\n', good_end)
+        if end == -1:
+            break  # Anything after the last newline is a half-written line
+        line = data[good_end:end]
+        if line:
+            try:
+                entry = _json.loads(line)
+            except ValueError:
+                break  # Half-written line from an interrupted save
+            progress['current_index'] = entry['i']
+            progress['score'] = entry['score']
+            progress['answers'].append(entry['answer'])
+        good_end = end + 1
+
+    # Cut off a torn tail so new answers aren't appended onto it
+    if good_end < len(data):
+        with open(PROGRESS_FILE, 'r+b') as f:
+            f.truncate(good_end)
+
+    return progress
+
+def load_quiz_questions():
+    """Load the questions picked for the saved quiz, in the order they are asked."""
+    with open(QUIZ_QUESTIONS_FILE, 'rb') as f:
+        return pickle.load(f)
+
+def save_quiz_questions(questions):
+    """Save the questions picked for this quiz once, so progress saves stay small."""
+    write_atomic(QUIZ_QUESTIONS_FILE, pickle.dumps(questions, protocol=pickle.HIGHEST_PROTOCOL))
+
+def dumps(obj):
+    """Serialize to compact JSON bytes with orjson, or json when it isn't installed."""
+    if _json.__name__ == 'orjson':
+        return _json.dumps(obj)
+    return _json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+def save_header(seed, total):
+    """Save the quiz settings once, when the quiz starts."""
+    header = {
+        'seed': seed,
+        'total': total
+    }
+    write_atomic(HEADER_FILE, dumps(header))
+
+def save_progress(log, current_index, score, answer):
+    """Append one answered question to the progress log."""
+    log.write(dumps({'i': current_index, 'score': score, 'answer': answer}) + b'\n')
+    log.flush()
+
+def clear_progress():
+    """Remove progress files."""
+    for filename in (HEADER_FILE, PROGRESS_FILE, QUIZ_QUESTIONS_FILE):
+        if os.path.exists(filename):
+            os.remove(filename)
+
+def ask_question(q, number, total):
+    """Show a question with its options and return the answer letter."""
+    # Each block of output is collected and written in one call
+    out = []
+    out.append(f"\nQuestion {number}/{total}:")
+    out.append("-" * 13)
+    out.append('')
+    out.append(q['question'])
+    out.append('')
+    out.append(q['_rendered_options'])
+    out.append('')
+    out.append("-" * 28)
+    sys.stdout.write('\n'.join(out) + '\n')
+
+    while True:
+        answer = input("\nYour answer (A/B/C/D): ").strip()
+        # Only a single character can be valid, so only that gets upper-cased
+        if len(answer) == 1:
+            answer = answer.upper()
+            if answer in VALID_ANSWERS:
+                return answer
+        print("Please enter A, B, C, or D")
+
+def show_feedback(q, answer):
+    """Show whether the answer was right, with the explanation and where the topic is covered."""
+    out = []
+    if answer == q['correct_answer']:
+        out.append("✓ Correct!")
+    else:
+        out.append(f"✗ Wrong. Correct answer: {q['correct_answer']}")
+    out.append("-" * 28)
+    out.append(f"\nExplanation: {q['explanation']}")
+    out.append(f"\nLearning Path: {q['learning_path']}")
+    out.append(f"Module: {q['module']}")
+    out.append('')
+    out.append("=" * 50)
+    sys.stdout.write('\n'.join(out) + '\n')
@@ -1,47 +1,17 @@
-import json
-import random
 import os
-from datetime import datetime
-
-PROGRESS_FILE = 'quiz_progress.json'
-
-def load_questions():
-    questions = []
-    with open('exam_questions.jsonl', 'r') as f:
-        for line in f:
-            questions.append(json.loads(line.strip()))
-    return questions
-
-def load_progress():
-    """Load saved progress if it exists."""
-    if os.path.exists(PROGRESS_FILE):
-        with open(PROGRESS_FILE, 'r') as f:
-            return json.load(f)
-    return None
+import random
+import sys
+from collections import defaultdict
 
-def save_progress(seed, current_index, score, answers, total, filtered_questions):
-    """Save current quiz progress."""
-    progress = {
-        'seed': seed,
-        'current_index': current_index,
-        'score': score,
-        'answers': answers,
-        'total': total,
-        'filtered_questions': filtered_questions,
-        'timestamp': datetime.now().isoformat()
-    }
-    with open(PROGRESS_FILE, 'w') as f:
-        json.dump(progress, f, indent=2)
+# The shared quiz code lives in 3_quiz-app at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, '3_quiz-app'))
 
-def clear_progress():
-    """Remove progress file."""
-    if os.path.exists(PROGRESS_FILE):
-        os.remove(PROGRESS_FILE)
+from quiz_core import (
+    PROGRESS_FILE, ask_question, clear_progress, load_progress, load_questions, load_quiz_questions,
+    save_header, save_progress, save_quiz_questions, show_feedback
+)
 
 def run_quiz():
-    questions = load_questions()
-    total_available = len(questions)
-    
     # Check for existing progress
     progress = load_progress()
     resume = False
@@ -60,22 +30,28 @@ def run_quiz():
             seed = progress['seed']
             current_index = progress['current_index']
             score = progress['score']
-            answers = progress['answers']
             total = progress['total']
-            questions = progress['filtered_questions']
+            questions = load_quiz_questions()
+            user_answers = bytearray(''.join(progress['answers']), 'ascii')
+            correct_answers = bytearray(''.join(q['correct_answer'] for q in questions[:len(user_answers)]), 'ascii')
         else:
             clear_progress()
     
     if not resume:
-        # Get all unique learning paths
-        learning_paths = sorted(set(q['learning_path'] for q in questions))
+        # The full question bank is only needed to set up a new quiz
+        questions = load_questions()
+
+        # Group questions by learning path in one pass
+        questions_by_path = defaultdict(list)
+        for q in questions:
+            questions_by_path[q['learning_path']].append(q)
+        learning_paths = sorted(questions_by_path)
         
         print("=" * 50)
         print("LEARNING PATHS")
         print("=" * 50)
         for i, path in enumerate(learning_paths, 1):
-            count = sum(1 for q in questions if q['learning_path'] == path)
-            print(f"{i}. {path} ({count} questions)")
+            print(f"{i}. {path} ({len(questions_by_path[path])} questions)")
         
         print("\n" + "=" * 50)
         filter_choice = input("\nFilter by learning paths? (Y/N): ").upper().strip()
@@ -87,9 +63,10 @@ def run_quiz():
             
             if selection:
                 try:
-                    selected_indices = [int(x.strip()) for x in selection.split(',')]
-                    selected_paths = [learning_paths[i-1] for i in selected_indices if 1 <= i <= len(learning_paths)]
-                    questions = [q for q in questions if q['learning_path'] in selected_paths]
+                    selected_indices = [int(x) for x in selection.split(',')]
+                    # dict.fromkeys drops repeated numbers so no path is counted twice
+                    selected_paths = list(dict.fromkeys(learning_paths[i-1] for i in selected_indices if 1 <= i <= len(learning_paths)))
+                    questions = [q for path in selected_paths for q in questions_by_path[path]]
                     print(f"\nFiltered to {len(questions)} questions from {len(selected_paths)} learning path(s)")
                 except (ValueError, IndexError):
                     print("Invalid selection, using all questions")
@@ -117,122 +94,94 @@ def run_quiz():
         seed = random.randint(0, 999999)
         current_index = 0
         score = 0
-        answers = []
-    
-    # Use seed for consistent shuffling
-    random.seed(seed)
-    random.shuffle(questions)
-    filtered_questions = questions[:total]  # Take only the requested number
-    questions = filtered_questions
+        # One byte per answered question, e.g. ord('B')
+        user_answers = bytearray()
+        correct_answers = bytearray()
+
+        # Draw the requested number of questions in random order, without touching the global RNG
+        questions = random.Random(seed).sample(questions, total)
+        clear_progress()
+        save_quiz_questions(questions)
+        save_header(seed, total)
 
-    if not resume:
         print("=" * 50)
         print(f"Azure Quiz - {total} questions")
         print("=" * 50)
 
-    for i in range(current_index, total):
-        q = questions[i]
-        print(f"\nQuestion {i+1}/{total}:")
-        print("-" * 13)
-        print()
-                
-        print(q['question'])
-        print()
-        
-        for option, text in q['options'].items():
-            print(f"{option}) {text}")
-        print()
-        print("-" * 28)
-        
-        while True:
-            answer = input("\nYour answer (A/B/C/D): ").upper().strip()
-            if answer in ['A', 'B', 'C', 'D']:
-                break
-            print("Please enter A, B, C, or D")
-            
-        if answer == q['correct_answer']:
-            print("✓ Correct!")
-            score += 1
-        else:
-            print(f"✗ Wrong. Correct answer: {q['correct_answer']}")
-        
-        # Track this answer
-        answers.append({
-            'user_answer': answer,
-            'correct_answer': q['correct_answer']
-        })
-        
-        # Save progress after each question
-        save_progress(seed, i + 1, score, answers, total, questions)
-            
-        print("-" * 28)
-        
-        print(f"\nExplanation: {q['explanation']}")
-        print(f"\nLearning Path: {q['learning_path']}")
-        print(f"Module: {q['module']}")
-        
-        print()
-        print("=" * 50)
+    # Answers are appended to the progress log as they come in
+    with open(PROGRESS_FILE, 'ab') as log:
+        for i in range(current_index, total):
+            q = questions[i]
+            answer = ask_question(q, i + 1, total)
+            if answer == q['correct_answer']:
+                score += 1
+
+            # Track this answer
+            user_answers.append(ord(answer))
+            correct_answers.append(ord(q['correct_answer']))
+
+            # Save progress after each question
+            save_progress(log, i + 1, score, answer)
+            show_feedback(q, answer)
 
-        if i < total - 1:
-            input("\nPress Enter for next question...")
+            if i < total - 1:
+                input("\nPress Enter for next question...")
 
     # Enhanced final feedback
-    print("\n" + "=" * 50)
-    print("QUIZ COMPLETE - RESULTS")
-    print("=" * 50)
+    out = []
+    out.append("\n" + "=" * 50)
+    out.append("QUIZ COMPLETE - RESULTS")
+    out.append("=" * 50)
     
     percentage = (score / total) * 100
-    print(f"\nFinal Score: {score}/{total} ({percentage:.1f}%)")
+    out.append(f"\nFinal Score: {score}/{total} ({percentage:.1f}%)")
     
     # Performance assessment
     if percentage >= 85:
-        print("Grade: EXCELLENT ✓✓✓ - You're well-prepared!")
+        out.append("Grade: EXCELLENT ✓✓✓ - You're well-prepared!")
     elif percentage >= 70:
-        print("Grade: PASS ✓✓ - Good job! Review weak areas.")
+        out.append("Grade: PASS ✓✓ - Good job! Review weak areas.")
     elif percentage >= 60:
-        print("Grade: BORDERLINE ✓ - More study needed.")
+        out.append("Grade: BORDERLINE ✓ - More study needed.")
     else:
-        print("Grade: NEEDS WORK ✗ - Focus on fundamentals.")
+        out.append("Grade: NEEDS WORK ✗ - Focus on fundamentals.")
     
-    # Analyze wrong answers by learning path
-    wrong_answers = [q for i, q in enumerate(questions) if i < len(answers) and answers[i]['user_answer'] != answers[i]['correct_answer']]
+    # Collect wrong answers and group them by learning path in one pass
+    wrong_answers = []
+    by_path = {}
+    for i, q in enumerate(questions[:len(user_answers)]):
+        if user_answers[i] != correct_answers[i]:
+            wrong_answers.append((i, q))
+            by_path.setdefault(q['learning_path'], []).append(q)
     
     if wrong_answers:
-        print(f"\n{'-' * 50}")
-        print(f"Areas Needing Review ({len(wrong_answers)} questions):")
-        print(f"{'-' * 50}")
-        
-        # Group by learning path
-        by_path = {}
-        for i, q in enumerate(questions):
-            if i < len(answers) and answers[i]['user_answer'] != answers[i]['correct_answer']:
-                path = q['learning_path']
-                if path not in by_path:
-                    by_path[path] = []
-                by_path[path].append(q)
+        out.append(f"\n{'-' * 50}")
+        out.append(f"Areas Needing Review ({len(wrong_answers)} questions):")
+        out.append(f"{'-' * 50}")
         
         for path, qs in sorted(by_path.items(), key=lambda x: len(x[1]), reverse=True):
-            print(f"\n• {path}: {len(qs)} incorrect")
+            out.append(f"\n• {path}: {len(qs)} incorrect")
             for q in qs[:3]:  # Show up to 3 modules per path
-                print(f"  - {q['module']}")
+                out.append(f"  - {q['module']}")
             if len(qs) > 3:
-                print(f"  - ... and {len(qs) - 3} more")
-        
-        print(f"\n{'-' * 50}")
-        print("Review Your Mistakes:")
-        print(f"{'-' * 50}")
-        
-        for i, q in enumerate(questions):
-            if i < len(answers) and answers[i]['user_answer'] != answers[i]['correct_answer']:
-                print(f"\nQ{i+1}: {q['question'][:80]}...")
-                print(f"   Your answer: {answers[i]['user_answer']} ✗")
-                print(f"   Correct: {answers[i]['correct_answer']} - {q['options'][answers[i]['correct_answer']]}")
-                print(f"   → {q['explanation'][:150]}...")
+                out.append(f"  - ... and {len(qs) - 3} more")
+        
+        out.append(f"\n{'-' * 50}")
+        out.append("Review Your Mistakes:")
+        out.append(f"{'-' * 50}")
+        
+        out.extend(
+            f"\nQ{i+1}: {q['_question_preview']}...\n"
+            f"   Your answer: {chr(user_answers[i])} ✗\n"
+            f"   Correct: {q['correct_answer']} - {q['options'][q['correct_answer']]}\n"
+            f"   → {q['_explanation_preview']}..."
+            for i, q in wrong_answers
+        )
     else:
-        print("\n🎉 Perfect score! You got every question right!")
+        out.append("\n🎉 Perfect score! You got every question right!")
     
-    print("\n" + "=" * 50)
+    out.append("\n" + "=" * 50)
+    sys.stdout.write('\n'.join(out) + '\n')
 
 if __name__ == "__main__":
     run_quiz()
\ No newline at end of file
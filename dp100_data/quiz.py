@@ -1,12 +1,11 @@
-import json
+import os
 import random
+import sys
 
-def load_questions():
-    questions = []
-    with open('exam_questions.jsonl', 'r') as f:
-        for line in f:
-            questions.append(json.loads(line.strip()))
-    return questions
+# The shared quiz code lives in 3_quiz-app at the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, '3_quiz-app'))
+
+from quiz_core import ask_question, load_questions, show_feedback
 
 def run_quiz():
     questions = load_questions()
@@ -20,38 +19,10 @@ def run_quiz():
     print("=" * 50)
 
     for i, q in enumerate(questions, 1):
-        print(f"\nQuestion {i}/{total}:")
-        print("-" * 13)
-        print()
-                
-        print(q['question'])
-        print()
-        
-        for option, text in q['options'].items():
-            print(f"{option}) {text}")
-        print()
-        print("-" * 28)
-        
-        while True:
-            answer = input("\nYour answer (A/B/C/D): ").upper().strip()
-            if answer in ['A', 'B', 'C', 'D']:
-                break
-            print("Please enter A, B, C, or D")
-            
+        answer = ask_question(q, i, total)
         if answer == q['correct_answer']:
-            print("✓ Correct!")
             score += 1
-        else:
-            print(f"✗ Wrong. Correct answer: {q['correct_answer']}")
-            
-        print("-" * 28)
-        
-        print(f"\nExplanation: {q['explanation']}")
-        print(f"\nLearning Path: {q['learning_path']}")
-        print(f"Module: {q['module']}")
-        
-        print()
-        print("=" * 50)
+        show_feedback(q, answer)
 
         if i < total:
             input("\nPress Enter for next question...")
@@ -59,4 +30,4 @@ def run_quiz():
     print(f"Final Score: {score}/{total} ({score/total*100:.0f}%)")
 
 if __name__ == "__main__":
-    run_quiz()
\ No newline at end of file
+    run_quiz()